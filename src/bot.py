@@ -19,18 +19,23 @@ Environment Variables Required:
 import os
 import logging
 import asyncio
-from datetime import datetime, time
-from typing import Optional, List, Dict
+from time import monotonic
+from typing import Optional, List, Dict, Tuple
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 
-from caldav_client import NextcloudTasksClient, Task
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 
-# Load environment variables
-load_dotenv()
+import strings
+from today import TODAY
+from caldav_client import NextcloudTasksClient, Task
+from pool import ObjectPool
 
 # Configure logging
 logging.basicConfig(
@@ -39,27 +44,82 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Bot configuration
-DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
-NEXTCLOUD_URL = os.getenv('NEXTCLOUD_URL')
-NEXTCLOUD_USER = os.getenv('NEXTCLOUD_USER')
-NEXTCLOUD_PASSWORD = os.getenv('NEXTCLOUD_PASSWORD')
-
-# Validate required environment variables
-if not all([DISCORD_TOKEN, NEXTCLOUD_URL, NEXTCLOUD_USER, NEXTCLOUD_PASSWORD]):
-    raise ValueError(
-        "Missing required environment variables. Please set:\n"
-        "  DISCORD_TOKEN\n"
-        "  NEXTCLOUD_URL\n"
-        "  NEXTCLOUD_USER\n"
-        "  NEXTCLOUD_PASSWORD"
+# Importing this module must stay free of side effects beyond logging: parse
+# worker processes import it as __mp_main__. Configuration is read and the bot
+# built in main().
+
+# How long task numbers from /task-list stay valid, and how often stale ones are swept
+TASK_CACHE_TTL = 600
+TASK_CACHE_SWEEP_INTERVAL = 60
+
+# Followup sends in flight at once, and retries when Discord answers 429
+SEND_CONCURRENCY = 5
+SEND_RETRIES = 3
+SEND_RETRY_BASE_DELAY = 0.25
+
+# Task cache key: (user ID, guild ID); guild ID is None in DMs
+CacheKey = Tuple[int, Optional[int]]
+
+# Enough to complete a listed task without looking it up: (UID, href, etag)
+TaskRef = Tuple[str, str, Optional[str]]
+
+
+def _reset_embed(embed: discord.Embed):
+    """Clear everything a handler may have set on a pooled embed."""
+    embed.clear_fields()
+    embed.remove_footer()
+    embed.title = None
+    embed.description = None
+    embed.colour = None
+
+
+# Response embeds are recycled rather than rebuilt for every command
+EMBED_POOL: ObjectPool[discord.Embed] = ObjectPool(discord.Embed, _reset_embed, 32)
+
+
+def _build_help_embed() -> discord.Embed:
+    """Build the /task-help embed."""
+    embed = discord.Embed(
+        title=strings.TITLE_HELP,
+        description=strings.DESCRIPTION_HELP,
+        color=discord.Color.purple()
+    )
+    
+    embed.add_field(
+        name=strings.HELP_ADD_NAME,
+        value=strings.HELP_ADD_VALUE,
+        inline=False
     )
+    
+    embed.add_field(
+        name=strings.HELP_LIST_NAME,
+        value=strings.HELP_LIST_VALUE,
+        inline=False
+    )
+    
+    embed.add_field(
+        name=strings.HELP_COMPLETE_NAME,
+        value=strings.HELP_COMPLETE_VALUE,
+        inline=False
+    )
+    
+    embed.set_footer(text=strings.FOOTER_HELP)
+    return embed
+
+
+# Embeds whose content never changes are built once and re-sent as-is
+HELP_EMBED = _build_help_embed()
+NO_TASKS_EMBED = discord.Embed(
+    title=strings.TITLE_TODAYS_TASKS,
+    description=strings.DESCRIPTION_NO_TASKS,
+    color=discord.Color.blue()
+)
 
 
 class TaskBot(commands.Bot):
     """Discord bot for managing Nextcloud tasks."""
     
-    def __init__(self):
+    def __init__(self, nextcloud_url: str, nextcloud_user: str, nextcloud_password: str):
         intents = discord.Intents.default()
         intents.message_content = True  # Required for DM handling in v1.1
         
@@ -67,14 +127,20 @@ class TaskBot(commands.Bot):
         
         # Initialize Nextcloud client
         self.tasks_client = NextcloudTasksClient(
-            url=NEXTCLOUD_URL,
-            username=NEXTCLOUD_USER,
-            password=NEXTCLOUD_PASSWORD
+            url=nextcloud_url,
+            username=nextcloud_user,
+            password=nextcloud_password
         )
         
-        # Cache for task ID mapping (task number -> CalDAV UID)
-        # This will be per-user in v2.0, for now it's global
-        self.task_cache: Dict[int, str] = {}
+        for command in (task_add, task_list, task_complete, task_help):
+            self.tree.add_command(command)
+        
+        # Task number mappings from each user's last /task-list, per server:
+        # (user, guild) -> (expires_at, {task number -> (UID, href, etag)})
+        self.task_cache: Dict[CacheKey, Tuple[float, Dict[int, TaskRef]]] = {}
+        self._cache_sweeper: Optional[asyncio.Task] = None
+        self._today_refresher: Optional[asyncio.Task] = None
+        self._send_sem = asyncio.Semaphore(SEND_CONCURRENCY)
         
     async def setup_hook(self):
         """Called when bot is starting up. Sync slash commands."""
@@ -82,7 +148,7 @@ class TaskBot(commands.Bot):
         
         # Verify Nextcloud connection
         try:
-            await asyncio.to_thread(self.tasks_client.test_connection)
+            await self.tasks_client.test_connection()
             logger.info("✅ Connected to Nextcloud successfully")
         except Exception as e:
             logger.error(f"❌ Failed to connect to Nextcloud: {e}")
@@ -98,194 +164,262 @@ class TaskBot(commands.Bot):
         logger.info(f'📡 Connected to {len(self.guilds)} server(s)')
         logger.info('🎉 Bot is ready!')
 
+        # on_ready fires again after reconnects, only start one sweeper
+        if self._cache_sweeper is None:
+            self._cache_sweeper = asyncio.create_task(self._sweep_task_cache())
+        if self._today_refresher is None:
+            self._today_refresher = asyncio.create_task(TODAY.run())
+
+    async def close(self):
+        """Shut down the Nextcloud client along with the Discord connection."""
+        try:
+            await super().close()
+        finally:
+            if self._cache_sweeper is not None:
+                self._cache_sweeper.cancel()
+            if self._today_refresher is not None:
+                self._today_refresher.cancel()
+            await self.tasks_client.aclose()
+
+    async def _sweep_task_cache(self):
+        """Periodically drop expired task number mappings."""
+        while True:
+            await asyncio.sleep(TASK_CACHE_SWEEP_INTERVAL)
+            now = monotonic()
+            expired = [key for key, (expires_at, _) in self.task_cache.items() if expires_at < now]
+            for key in expired:
+                del self.task_cache[key]
+            if expired:
+                logger.debug(f"Swept {len(expired)} expired task cache entries")
+
+    async def _send(self, interaction: discord.Interaction, **kwargs):
+        """
+        Send an interaction followup, retrying with backoff if rate limited.
+
+        discord.py already waits out most rate limits itself; this caps how
+        many followups burst at once and retries the 429s it gives up on.
+        """
+        async with self._send_sem:
+            for attempt in range(SEND_RETRIES):
+                try:
+                    return await interaction.followup.send(**kwargs)
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt == SEND_RETRIES - 1:
+                        raise
+                    logger.warning(
+                        f"⏳ Rate limited sending followup, retry {attempt + 1}/{SEND_RETRIES - 1}"
+                    )
+                    await asyncio.sleep(SEND_RETRY_BASE_DELAY * 2 ** attempt)
+
+
+def _cache_key(interaction: discord.Interaction) -> CacheKey:
+    """Task numbers are scoped to the user and the server they listed in."""
+    return (interaction.user.id, interaction.guild_id)
+
 
-# Create bot instance
-bot = TaskBot()
+def _due_str(task: Task) -> str:
+    """Due time shown in /task-list."""
+    return task.due.strftime(strings.TIME_FMT) if task.due else strings.VALUE_NO_DUE_TIME
 
 
-@bot.tree.command(name="task-add", description="Add a new task (due today at 11:59 PM)")
-@app_commands.describe(title="What needs to be done?")
+@app_commands.command(name="task-add", description=strings.DESC_TASK_ADD)
+@app_commands.describe(title=strings.DESC_TASK_ADD_TITLE)
 async def task_add(interaction: discord.Interaction, title: str):
     """Add a new task to Nextcloud."""
+    bot: TaskBot = interaction.client
     await interaction.response.defer(thinking=True)
     
     try:
         # Create task with due date of today at 11:59 PM
-        today = datetime.now().date()
-        due_datetime = datetime.combine(today, time(23, 59))
+        due_datetime = TODAY.due_23_59
         
         logger.info(f"Creating task: '{title}' due {due_datetime}")
         
-        # Create task via CalDAV (runs in thread to avoid blocking)
-        task = await asyncio.to_thread(
-            bot.tasks_client.create_task,
+        # Create task via CalDAV
+        task = await bot.tasks_client.create_task(
             title=title,
             due=due_datetime
         )
         
         # Send confirmation
-        embed = discord.Embed(
-            title="✅ Task Created",
-            description=f"**{title}**",
-            color=discord.Color.green()
-        )
-        embed.add_field(name="Due", value="Today at 11:59 PM", inline=True)
-        embed.add_field(name="Status", value="📝 To Do", inline=True)
-        embed.set_footer(text="Use /task-list to see all tasks")
-        
-        await interaction.followup.send(embed=embed)
+        embed = EMBED_POOL.acquire()
+        try:
+            embed.title = strings.TITLE_TASK_CREATED
+            embed.description = strings.DESCRIPTION_TASK_CREATED.format(title=title)
+            embed.colour = discord.Color.green()
+            embed.add_field(name=strings.FIELD_DUE, value=strings.VALUE_DUE_TODAY, inline=True)
+            embed.add_field(name=strings.FIELD_STATUS, value=strings.VALUE_STATUS_TODO, inline=True)
+            embed.set_footer(text=strings.FOOTER_TASK_CREATED)
+            
+            await bot._send(interaction, embed=embed)
+        finally:
+            EMBED_POOL.release(embed)
         logger.info(f"✅ Task created: {task.uid}")
         
     except Exception as e:
         logger.error(f"❌ Failed to create task: {e}", exc_info=True)
-        await interaction.followup.send(
-            f"❌ Failed to create task: {str(e)}",
+        await bot._send(
+            interaction,
+            content=strings.ERROR_CREATE_TASK.format(error=e),
             ephemeral=True
         )
 
 
-@bot.tree.command(name="task-list", description="List today's tasks")
+@app_commands.command(name="task-list", description=strings.DESC_TASK_LIST)
 async def task_list(interaction: discord.Interaction):
     """List all tasks due today."""
+    bot: TaskBot = interaction.client
     await interaction.response.defer(thinking=True)
     
     try:
         logger.info("Fetching today's tasks...")
         
         # Fetch tasks from Nextcloud
-        tasks = await asyncio.to_thread(bot.tasks_client.get_tasks_due_today)
+        tasks = await bot.tasks_client.get_tasks_due_today()
         
         if not tasks:
-            embed = discord.Embed(
-                title="📋 Today's Tasks",
-                description="No tasks for today! 🎉",
-                color=discord.Color.blue()
-            )
-            await interaction.followup.send(embed=embed)
+            await bot._send(interaction, embed=NO_TASKS_EMBED)
             return
         
-        # Filter to incomplete tasks only (v0.1 doesn't show completed)
-        incomplete_tasks = [t for t in tasks if not t.completed]
-        
-        # Update task cache for completion command
-        bot.task_cache.clear()
-        for idx, task in enumerate(incomplete_tasks, 1):
-            bot.task_cache[idx] = task.uid
-        
-        # Build embed
-        embed = discord.Embed(
-            title="📋 Today's Tasks",
-            description=f"You have {len(incomplete_tasks)} task(s) to complete",
-            color=discord.Color.blue()
+        # Update this user's task cache for completion command
+        bot.task_cache[_cache_key(interaction)] = (
+            monotonic() + TASK_CACHE_TTL,
+            {idx: (task.uid, task.href, task.etag) for idx, task in enumerate(tasks, 1)}
         )
         
-        for idx, task in enumerate(incomplete_tasks, 1):
-            due_str = task.due.strftime("%I:%M %p") if task.due else "No time set"
-            embed.add_field(
-                name=f"{idx}. {task.title}",
-                value=f"Due: {due_str}",
-                inline=False
-            )
-        
-        embed.set_footer(text="Use /task-complete <number> to mark tasks done")
-        
-        await interaction.followup.send(embed=embed)
-        logger.info(f"✅ Listed {len(incomplete_tasks)} tasks")
+        # Build embed
+        embed = EMBED_POOL.acquire()
+        try:
+            embed.title = strings.TITLE_TODAYS_TASKS
+            embed.description = strings.DESCRIPTION_TASK_COUNT.format(count=len(tasks))
+            embed.colour = discord.Color.blue()
+            
+            # Same dicts add_field() would append, built in one pass; relies on
+            # Embed._fields, which is why discord.py is pinned in pyproject.toml
+            embed._fields = [
+                {
+                    'inline': False,
+                    'name': strings.FIELD_TASK.format(number=idx, title=task.title),
+                    'value': strings.VALUE_TASK_DUE.format(due=_due_str(task)),
+                }
+                for idx, task in enumerate(tasks, 1)
+            ]
+            
+            embed.set_footer(text=strings.FOOTER_TASK_LIST)
+            
+            await bot._send(interaction, embed=embed)
+        finally:
+            EMBED_POOL.release(embed)
+        logger.info(f"✅ Listed {len(tasks)} tasks")
         
     except Exception as e:
         logger.error(f"❌ Failed to list tasks: {e}", exc_info=True)
-        await interaction.followup.send(
-            f"❌ Failed to list tasks: {str(e)}",
+        await bot._send(
+            interaction,
+            content=strings.ERROR_LIST_TASKS.format(error=e),
             ephemeral=True
         )
 
 
-@bot.tree.command(name="task-complete", description="Mark a task as complete")
-@app_commands.describe(task_id="Task number from /task-list")
+@app_commands.command(name="task-complete", description=strings.DESC_TASK_COMPLETE)
+@app_commands.describe(task_id=strings.DESC_TASK_COMPLETE_ID)
 async def task_complete(interaction: discord.Interaction, task_id: int):
     """Mark a task as complete."""
+    bot: TaskBot = interaction.client
     await interaction.response.defer(thinking=True)
     
     try:
+        # Look up this user's numbering; expired numbers are rejected rather than
+        # re-listed, since a fresh list may number tasks differently
+        key = _cache_key(interaction)
+        expires_at, mapping = bot.task_cache.get(key, (0.0, {}))
+        if monotonic() > expires_at:
+            bot.task_cache.pop(key, None)
+            mapping = {}
+        
         # Validate task ID
-        if task_id not in bot.task_cache:
-            await interaction.followup.send(
-                f"❌ Invalid task number: {task_id}\n"
-                f"Use /task-list to see current task numbers.",
+        if task_id not in mapping:
+            await bot._send(
+                interaction,
+                content=strings.ERROR_INVALID_TASK_NUMBER.format(task_id=task_id),
                 ephemeral=True
             )
             return
         
-        # Get CalDAV UID from cache
-        task_uid = bot.task_cache[task_id]
+        # Get CalDAV location from cache
+        task_uid, task_href, task_etag = mapping[task_id]
         
         logger.info(f"Completing task {task_id} (UID: {task_uid})")
         
         # Mark complete via CalDAV
-        task_title = await asyncio.to_thread(
-            bot.tasks_client.complete_task,
-            uid=task_uid
+        task_title = await bot.tasks_client.complete_task(
+            uid=task_uid,
+            href=task_href,
+            etag=task_etag
         )
         
         # Send celebration
-        embed = discord.Embed(
-            title="✅ Task Completed!",
-            description=f"~~{task_title}~~",
-            color=discord.Color.green()
-        )
-        embed.set_footer(text="Great job! 🎉")
-        
-        await interaction.followup.send(embed=embed)
+        embed = EMBED_POOL.acquire()
+        try:
+            embed.title = strings.TITLE_TASK_COMPLETED
+            embed.description = strings.DESCRIPTION_TASK_COMPLETED.format(title=task_title)
+            embed.colour = discord.Color.green()
+            embed.set_footer(text=strings.FOOTER_TASK_COMPLETED)
+            
+            await bot._send(interaction, embed=embed)
+        finally:
+            EMBED_POOL.release(embed)
         logger.info(f"✅ Task completed: {task_uid}")
         
         # Remove from cache
-        del bot.task_cache[task_id]
+        mapping.pop(task_id, None)
         
     except Exception as e:
         logger.error(f"❌ Failed to complete task: {e}", exc_info=True)
-        await interaction.followup.send(
-            f"❌ Failed to complete task: {str(e)}",
+        await bot._send(
+            interaction,
+            content=strings.ERROR_COMPLETE_TASK.format(error=e),
             ephemeral=True
         )
 
 
-@bot.tree.command(name="task-help", description="Show help for task commands")
+@app_commands.command(name="task-help", description=strings.DESC_TASK_HELP)
 async def task_help(interaction: discord.Interaction):
     """Display help information."""
-    embed = discord.Embed(
-        title="📖 Task Bot Help - v0.1 MVP",
-        description="Manage your Nextcloud tasks from Discord!",
-        color=discord.Color.purple()
-    )
-    
-    embed.add_field(
-        name="/task-add <title>",
-        value="Create a new task due today at 11:59 PM\nExample: `/task-add Buy groceries`",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="/task-list",
-        value="Show all incomplete tasks due today",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="/task-complete <number>",
-        value="Mark a task as complete\nExample: `/task-complete 1`",
-        inline=False
-    )
-    
-    embed.set_footer(text="More features coming in v1.0!")
-    
-    await interaction.response.send_message(embed=embed)
+    await interaction.response.send_message(embed=HELP_EMBED)
 
 
 def main():
     """Main entry point."""
+    # Load environment variables
+    load_dotenv()
+    
+    # Bot configuration
+    discord_token = os.getenv('DISCORD_TOKEN')
+    nextcloud_url = os.getenv('NEXTCLOUD_URL')
+    nextcloud_user = os.getenv('NEXTCLOUD_USER')
+    nextcloud_password = os.getenv('NEXTCLOUD_PASSWORD')
+    
+    # Validate required environment variables
+    if not all([discord_token, nextcloud_url, nextcloud_user, nextcloud_password]):
+        raise ValueError(
+            "Missing required environment variables. Please set:\n"
+            "  DISCORD_TOKEN\n"
+            "  NEXTCLOUD_URL\n"
+            "  NEXTCLOUD_USER\n"
+            "  NEXTCLOUD_PASSWORD"
+        )
+    
     try:
         logger.info("🚀 Starting Nextcloud Tasks Bot v0.1...")
-        bot.run(DISCORD_TOKEN)
+        
+        # libuv-based event loop where available, the stock asyncio loop otherwise
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("Using uvloop event loop")
+        
+        bot = TaskBot(nextcloud_url, nextcloud_user, nextcloud_password)
+        bot.run(discord_token)
     except KeyboardInterrupt:
         logger.info("👋 Bot stopped by user")
     except Exception as e:
@@ -2,21 +2,131 @@
 CalDAV client for interacting with Nextcloud Tasks.
 
 Handles VTODO creation, retrieval, and completion via CalDAV protocol.
+Requests are issued directly with aiohttp so every method is a native
+coroutine that can be awaited from the bot's event loop.
 """
 
+import asyncio
 import logging
-from datetime import datetime, date
-from typing import List, Optional
+import multiprocessing
+import os
+import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date, timedelta, timezone
+from time import monotonic
+from typing import List, Mapping, Optional, Tuple
 from dataclasses import dataclass
+from urllib.parse import urljoin
+from zoneinfo import ZoneInfo
 
-import caldav
-from caldav import DAVClient
-from icalendar import Calendar, Todo
+import aiohttp
+from icalendar import Calendar, Todo, vDatetime
+from lxml import etree
+
+from today import TODAY
 
 logger = logging.getLogger(__name__)
 
+# XML namespaces used in CalDAV requests and responses
+NS = {'d': 'DAV:', 'c': 'urn:ietf:params:xml:ns:caldav'}
+
+# Calendar collections listed by the calendar-home PROPFIND
+_CALENDAR_XP = etree.XPath(
+    '/d:multistatus/d:response[d:propstat/d:prop/d:resourcetype/c:calendar]',
+    namespaces=NS
+)
+_CALENDAR_NAME_XP = etree.XPath('string(d:propstat/d:prop/d:displayname)', namespaces=NS)
+_CALENDAR_COMPS_XP = etree.XPath(
+    'd:propstat/d:prop/c:supported-calendar-component-set/c:comp/@name',
+    namespaces=NS
+)
+
+# Objects returned by the VTODO calendar-query REPORT
+_TODO_XP = etree.XPath(
+    '/d:multistatus/d:response[d:propstat/d:prop/c:calendar-data != ""]',
+    namespaces=NS
+)
+_TODO_ETAG_XP = etree.XPath('string(d:propstat/d:prop/d:getetag)', namespaces=NS)
+_TODO_DATA_XP = etree.XPath('string(d:propstat/d:prop/c:calendar-data)', namespaces=NS)
+
+# Href of any multistatus response
+_HREF_XP = etree.XPath('string(d:href)', namespaces=NS)
+
+_PROPFIND_CALENDARS = b"""<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+  <d:prop>
+    <d:resourcetype/>
+    <d:displayname/>
+    <c:supported-calendar-component-set/>
+  </d:prop>
+</d:propfind>"""
+
+# calendar-query returning VTODOs; {filters} is spliced into the VTODO comp-filter
+_REPORT_TODOS = """<?xml version="1.0" encoding="utf-8"?>
+<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+  <d:prop>
+    <d:getetag/>
+    <c:calendar-data/>
+  </d:prop>
+  <c:filter>
+    <c:comp-filter name="VCALENDAR">
+      <c:comp-filter name="VTODO">{filters}</c:comp-filter>
+    </c:comp-filter>
+  </c:filter>
+</c:calendar-query>"""
+
+_UTC_FORMAT = '%Y%m%dT%H%M%SZ'
+
+# Furthest any timezone is from UTC (UTC+14), for matching floating times
+_MAX_UTC_OFFSET = timedelta(hours=14)
+
+_XML_HEADERS = {'Content-Type': 'application/xml; charset=utf-8', 'Depth': '1'}
+
+# Fast VTODO scanning: the VTODO body, nested components inside it, folded
+# line continuations, and NAME;PARAMS:VALUE content lines (quoted parameter
+# values may contain ':' and ';')
+_VTODO_RE = re.compile(rb'^BEGIN:VTODO\r?$(.*?)^END:VTODO\r?$', re.M | re.S)
+_SUBCOMPONENT_RE = re.compile(rb'^BEGIN:([A-Z-]+)\r?$.*?^END:\1\r?$', re.M | re.S)
+_FOLD_RE = re.compile(rb'\r?\n[ \t]')
+_PROPERTY_RE = re.compile(
+    rb'^(UID|SUMMARY|DUE|STATUS|PRIORITY|DESCRIPTION|COMPLETED)'
+    rb'((?:;(?:"[^"]*"|[^";:\r\n])*)*):([^\r\n]*)',
+    re.M
+)
+_END_VTODO_RE = re.compile(rb'^END:VTODO\r?$', re.M)
+_NESTED_BEGIN_RE = re.compile(rb'^BEGIN:', re.M)
+_STATUS_LINE_RE = re.compile(rb'^STATUS[;:][^\r\n]*', re.M)
+_COMPLETED_LINE_RE = re.compile(rb'^COMPLETED[;:][^\r\n]*', re.M)
+_PERCENT_LINE_RE = re.compile(rb'^PERCENT-COMPLETE[;:][^\r\n]*', re.M)
+_TZID_RE = re.compile(rb';TZID="?([^";:]+)')
+_ESCAPE_RE = re.compile(rb'\\([\\;,nN])')
+_UNESCAPED = {b'\\': b'\\', b';': b';', b',': b',', b'n': b'\n', b'N': b'\n'}
+
+# Seconds a get_tasks_due_today() result is reused for repeat /task-list calls
+TASKS_CACHE_TTL = 15
+
+# Below this many todos, parsing inline beats shipping data to worker processes
+PARSE_POOL_THRESHOLD = 16
+
 
-@dataclass
+def _parse_pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for parse workers.
+
+    Never fork: the parent runs aiohttp and discord.py threads whose held
+    locks a forked child would inherit. The forkserver preloads only this
+    module, so workers don't start from a copy of the bot. Windows has no
+    forkserver and uses spawn.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+@dataclass(slots=True, frozen=True)
 class Task:
     """Represents a task from Nextcloud."""
     uid: str
@@ -26,20 +136,67 @@ class Task:
     completed_date: Optional[datetime] = None
     description: Optional[str] = None
     priority: int = 0
-    
+    href: Optional[str] = None
+    etag: Optional[str] = None
+
     def __str__(self):
         status = "✅" if self.completed else "📝"
         due_str = f" (due {self.due.strftime('%Y-%m-%d %H:%M')})" if self.due else ""
         return f"{status} {self.title}{due_str}"
 
 
+class CalDAVError(Exception):
+    """The CalDAV server answered with an unexpected HTTP status."""
+
+    def __init__(self, method: str, url: str, status: int):
+        super().__init__(f"{method} {url} returned HTTP {status}")
+        self.status = status
+
+
+class _TasksCache:
+    """
+    Short-lived cache of one get_tasks_due_today() result.
+
+    Callers hold `lock` across check-fetch-store so concurrent misses share a
+    single fetch. `generation` moves on every invalidation; a result fetched
+    under an older generation is not stored, so a write that lands mid-fetch
+    is never hidden behind a stale entry.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.lock = asyncio.Lock()
+        self.generation = 0
+        self._key = None
+        self._expires_at = 0.0
+        self._tasks: List[Task] = []
+
+    def get(self, key) -> Optional[List[Task]]:
+        """Return the cached tasks for key, or None if missing or expired."""
+        if key == self._key and monotonic() < self._expires_at:
+            return list(self._tasks)
+        return None
+
+    def set(self, key, tasks: List[Task], generation: int):
+        """Store tasks for key if nothing was invalidated since generation."""
+        if generation == self.generation:
+            self._key = key
+            self._expires_at = monotonic() + self.ttl
+            self._tasks = list(tasks)
+
+    def invalidate(self):
+        """Drop the cached result, e.g. after creating or completing a task."""
+        self.generation += 1
+        self._key = None
+
+
 class NextcloudTasksClient:
     """Client for managing tasks in Nextcloud via CalDAV."""
-    
+
     def __init__(self, url: str, username: str, password: str):
         """
         Initialize Nextcloud Tasks client.
-        
+
         Args:
             url: Nextcloud base URL (e.g., https://nextcloud.dawnfire.casa)
             username: Nextcloud username
@@ -47,260 +204,652 @@ class NextcloudTasksClient:
         """
         self.url = url
         self.username = username
-        
-        # Build CalDAV URL
-        caldav_url = f"{url}/remote.php/dav"
-        
-        logger.info(f"Initializing CalDAV client for {caldav_url}")
-        
-        # Create DAV client
-        self.client = DAVClient(
-            url=caldav_url,
-            username=username,
-            password=password
-        )
-        
+        self._password = password
+
+        # Build CalDAV calendar home URL
+        self.calendar_home = f"{url.rstrip('/')}/remote.php/dav/calendars/{username}/"
+
+        logger.info(f"Initializing CalDAV client for {self.calendar_home}")
+
+        # Created lazily, aiohttp sessions must be opened inside the event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+
         # Will be set on first connection
-        self._calendar = None
-        
-    def test_connection(self) -> bool:
+        self._calendar_url: Optional[str] = None
+        self._connect_lock = asyncio.Lock()
+
+        # Absorbs bursts of /task-list calls
+        self._tasks_cache = _TasksCache(TASKS_CACHE_TTL)
+
+        # Large todo lists are parsed off the event loop; workers start on first use
+        self._parse_workers = min(4, os.cpu_count() or 1)
+        self._parse_pool = ProcessPoolExecutor(
+            max_workers=self._parse_workers,
+            mp_context=_parse_pool_context()
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared HTTP session, creating it on first use.
+
+        Every request goes through this one session so its pooled keep-alive
+        connections spare each command a fresh TCP + TLS handshake.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                auth=aiohttp.BasicAuth(self.username, self._password),
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=75, ttl_dns_cache=300)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the HTTP session and stop any parse workers."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        # Waiting lets the pool release its semaphores; do it off the event loop
+        await asyncio.to_thread(self._parse_pool.shutdown, wait=True, cancel_futures=True)
+
+    async def _request(self, method: str, url: str, expected: Tuple[int, ...],
+                       **kwargs) -> Tuple[bytes, Mapping[str, str]]:
+        """
+        Issue a single HTTP request against Nextcloud.
+
+        Args:
+            method: HTTP/WebDAV method (GET, PUT, PROPFIND, REPORT, ...)
+            url: Absolute request URL
+            expected: Status codes treated as success
+            **kwargs: Passed through to aiohttp (data, headers, ...)
+
+        Returns:
+            Response body and headers
+        """
+        async with self._get_session().request(method, url, **kwargs) as resp:
+            body = await resp.read()
+            if resp.status not in expected:
+                raise CalDAVError(method, url, resp.status)
+            return body, resp.headers
+
+    async def _report_todos(self, filters: str = "") -> List[Tuple[str, str, bytes]]:
+        """
+        Run a calendar-query REPORT for VTODOs on the task calendar.
+
+        Args:
+            filters: Extra CalDAV filter elements for the VTODO comp-filter
+
+        Returns:
+            List of (absolute href, etag, calendar data) triples
+        """
+        body, _ = await self._request(
+            'REPORT', self._calendar_url, (207,),
+            data=_REPORT_TODOS.format(filters=filters).encode(),
+            headers=_XML_HEADERS
+        )
+
+        # Evaluated per response rather than zipping document-wide lists, so
+        # a response missing its etag cannot shift the others out of line
+        return [
+            (
+                urljoin(self._calendar_url, _HREF_XP(response)),
+                _TODO_ETAG_XP(response) or None,
+                _TODO_DATA_XP(response).encode()
+            )
+            for response in _TODO_XP(etree.fromstring(body))
+        ]
+
+    async def test_connection(self) -> bool:
         """
         Test connection to Nextcloud.
-        
+
         Returns:
             True if connection successful
-            
+
+        Raises:
+            Exception if connection fails
+        """
+        async with self._connect_lock:
+            await self._connect()
+        return True
+
+    async def _connect(self):
+        """
+        Discover the task calendar. Callers must hold _connect_lock.
+
         Raises:
             Exception if connection fails
         """
         logger.info("Testing Nextcloud connection...")
-        
+
         try:
-            principal = self.client.principal()
-            calendars = principal.calendars()
-            
+            body, _ = await self._request(
+                'PROPFIND', self.calendar_home, (207,),
+                data=_PROPFIND_CALENDARS,
+                headers=_XML_HEADERS
+            )
+            calendars = _CALENDAR_XP(etree.fromstring(body))
+
             logger.info(f"✅ Connected! Found {len(calendars)} calendar(s)")
-            
-            # Find first calendar that supports tasks (has VTODO)
+
+            # Use the first calendar that supports tasks (has VTODO)
+            # In v2.0, we'll be smarter about calendar selection
             for cal in calendars:
-                # Try to get calendar properties
-                try:
-                    # Check if calendar supports tasks
-                    # For now, just use the first calendar we find
-                    # In v2.0, we'll be smarter about calendar selection
-                    self._calendar = cal
-                    logger.info(f"Using calendar: {cal.name}")
-                    break
-                except Exception as e:
-                    logger.debug(f"Skipping calendar: {e}")
+                components = _CALENDAR_COMPS_XP(cal)
+                if components and 'VTODO' not in components:
+                    logger.debug(f"Skipping calendar without VTODO: {_CALENDAR_NAME_XP(cal)}")
                     continue
-            
-            if not self._calendar:
-                raise Exception("No suitable task calendar found")
-            
-            return True
-            
+
+                self._calendar_url = urljoin(self.calendar_home, _HREF_XP(cal))
+                logger.info(f"Using calendar: {_CALENDAR_NAME_XP(cal)}")
+                return
+
+            raise Exception("No suitable task calendar found")
+
         except Exception as e:
             logger.error(f"❌ Connection failed: {e}")
             raise Exception(f"Failed to connect to Nextcloud: {e}")
-    
-    def _ensure_connected(self):
-        """Ensure we're connected and have a calendar."""
-        if not self._calendar:
-            self.test_connection()
-    
-    def create_task(self, title: str, due: Optional[datetime] = None, 
-                   description: Optional[str] = None) -> Task:
+
+    async def _ensure_connected(self):
+        """
+        Ensure we're connected and have a calendar.
+
+        Checked again under the lock so a burst of first commands runs one
+        calendar discovery rather than one each.
+        """
+        if self._calendar_url:
+            return
+
+        async with self._connect_lock:
+            if self._calendar_url:
+                return
+            await self._connect()
+
+    async def create_task(self, title: str, due: Optional[datetime] = None,
+                          description: Optional[str] = None) -> Task:
         """
         Create a new task in Nextcloud.
-        
+
         Args:
             title: Task title/summary
             due: Due date/time (optional)
             description: Task description/notes (optional)
-            
+
         Returns:
             Created Task object
         """
-        self._ensure_connected()
-        
+        await self._ensure_connected()
+
         logger.info(f"Creating task: {title}")
-        
+
         # Create iCalendar VTODO
         cal = Calendar()
         todo = Todo()
-        
+        uid = str(uuid.uuid4())
+
         # Required fields
+        cal.add('prodid', '-//nextasks//Nextcloud Tasks Discord Bot//EN')
+        cal.add('version', '2.0')
         todo.add('summary', title)
         todo.add('status', 'NEEDS-ACTION')
-        todo.add('uid', caldav.lib.url.make_uid())
-        
+        todo.add('uid', uid)
+        todo.add('dtstamp', datetime.now(timezone.utc))
+
         # Optional fields
         if due:
             todo.add('due', due)
-        
+
         if description:
             todo.add('description', description)
-        
+
         # Add to calendar
         cal.add_component(todo)
-        
-        # Save to Nextcloud
-        ical_data = cal.to_ical()
-        created_todo = self._calendar.save_todo(ical_data)
-        
-        logger.info(f"✅ Task created: {todo['uid']}")
-        
+
+        # Save to Nextcloud (If-None-Match guards against clobbering an existing UID)
+        await self._request(
+            'PUT', urljoin(self._calendar_url, f"{uid}.ics"), (201, 204),
+            data=cal.to_ical(),
+            headers={'Content-Type': 'text/calendar; charset=utf-8', 'If-None-Match': '*'}
+        )
+
+        self._tasks_cache.invalidate()
+        logger.info(f"✅ Task created: {uid}")
+
         return Task(
-            uid=str(todo['uid']),
+            uid=uid,
             title=title,
             due=due,
             completed=False,
             description=description
         )
-    
-    def get_tasks_due_today(self) -> List[Task]:
+
+    async def get_tasks_due_today(self) -> List[Task]:
         """
-        Get all tasks due today.
-        
+        Get the incomplete tasks due today, earliest first.
+
+        Results are reused for TASKS_CACHE_TTL seconds; creating or completing
+        a task through this client invalidates them.
+
         Returns:
             List of Task objects
         """
-        self._ensure_connected()
-        
+        await self._ensure_connected()
+
+        # One snapshot of the shared date range for the whole call
+        today, start, end = TODAY.date, TODAY.start, TODAY.end
+        key = (self._calendar_url, today)
+
+        async with self._tasks_cache.lock:
+            tasks = self._tasks_cache.get(key)
+            if tasks is not None:
+                logger.info(f"Using cached list of {len(tasks)} task(s) due today")
+                return tasks
+
+            generation = self._tasks_cache.generation
+            tasks = await self._fetch_tasks_due_today(today, start, end)
+            self._tasks_cache.set(key, tasks, generation)
+            return tasks
+
+    async def _fetch_tasks_due_today(self, today: date, start: datetime,
+                                     end: datetime) -> List[Task]:
+        """Query Nextcloud for the incomplete tasks due between start and end (UTC)."""
         logger.info("Fetching today's tasks...")
-        
+
         try:
-            # Get today's date range
-            today = date.today()
-            start = datetime.combine(today, datetime.min.time())
-            end = datetime.combine(today, datetime.max.time())
-            
-            # Search for todos due today
-            # Note: caldav library's search is a bit finnicky, so we'll get all
-            # todos and filter ourselves for v0.1
-            todos = self._calendar.todos(include_completed=False)
-            
-            tasks = []
-            for todo_obj in todos:
-                try:
-                    task = self._parse_todo(todo_obj)
-                    
-                    # Filter to tasks due today
-                    if task.due and task.due.date() == today:
-                        tasks.append(task)
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to parse todo: {e}")
-                    continue
-            
+            # Let the server filter to incomplete todos due around today.
+            # Nextcloud compares floating DUE values (which /task-add writes)
+            # as if they were UTC, so the window is widened by the largest UTC
+            # offset on both sides; this also keeps date-only DUE values, which
+            # RFC 4791 matches only when strictly after the range start. The
+            # local date check below trims the extra results. Completion is
+            # filtered on the COMPLETED property rather than STATUS, since a
+            # STATUS text-match would also drop todos that have no STATUS.
+            todos = await self._report_todos(
+                f'<c:time-range start="{(start - _MAX_UTC_OFFSET).strftime(_UTC_FORMAT)}"'
+                f' end="{(end + _MAX_UTC_OFFSET).strftime(_UTC_FORMAT)}"/>'
+                '<c:prop-filter name="COMPLETED"><c:is-not-defined/></c:prop-filter>'
+            )
+
+            # v0.1 only shows incomplete tasks due today; STATUS:COMPLETED
+            # without a COMPLETED date still gets past the server filter
+            tasks = [
+                task for task in await self._parse_todos(todos)
+                if task is not None and not task.completed
+                and task.due and _local_date(task.due) == today
+            ]
+
+            # CalDAV has no ORDER BY, so the small filtered list is sorted here
+            tasks.sort(key=_local_due)
             logger.info(f"Found {len(tasks)} task(s) due today")
-            return sorted(tasks, key=lambda t: t.due or datetime.max)
-            
+            return tasks
+
         except Exception as e:
             logger.error(f"Failed to fetch tasks: {e}", exc_info=True)
             raise
-    
-    def complete_task(self, uid: str) -> str:
+
+    async def _parse_todos(self, todos: List[Tuple[str, str, bytes]]
+                           ) -> List[Optional[Task]]:
+        """
+        Parse REPORT results, in worker processes when there are many.
+
+        Args:
+            todos: (href, etag, calendar data) triples
+
+        Returns:
+            One Task, or None if it could not be parsed, per input in order
+        """
+        if len(todos) <= PARSE_POOL_THRESHOLD:
+            return _parse_batch(todos)
+
+        # One chunk per worker keeps pickling round trips to a minimum
+        size = -(-len(todos) // self._parse_workers)
+        chunks = [todos[i:i + size] for i in range(0, len(todos), size)]
+
+        loop = asyncio.get_running_loop()
+        batches = await asyncio.gather(
+            *(loop.run_in_executor(self._parse_pool, _parse_batch, chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        results = []
+        for chunk, batch in zip(chunks, batches):
+            # BaseException: aclose() cancels pending futures, which gather()
+            # hands back as CancelledError
+            if isinstance(batch, BaseException):
+                logger.warning(f"Parse worker failed ({batch}), parsing inline")
+                batch = _parse_batch(chunk)
+            results.extend(batch)
+        return results
+
+    async def complete_task(self, uid: str, href: str, etag: Optional[str] = None) -> str:
         """
         Mark a task as complete.
-        
+
+        The task's calendar object is fetched and written back directly, so
+        this costs one GET and one PUT however big the calendar is.
+
         Args:
             uid: Task UID
-            
+            href: URL of the task's calendar object (Task.href)
+            etag: ETag the task was listed with (Task.etag), used if the
+                server doesn't send one with the object
+
         Returns:
             Task title (for confirmation message)
         """
-        self._ensure_connected()
-        
+        await self._ensure_connected()
+
         logger.info(f"Completing task: {uid}")
-        
+
         try:
-            # Get all todos (includes completed for finding by UID)
-            todos = self._calendar.todos(include_completed=True)
-            
-            # Find the specific todo
-            for todo_obj in todos:
-                try:
-                    # Parse the ical data
-                    ical = Calendar.from_ical(todo_obj.data)
-                    
-                    for component in ical.walk('VTODO'):
-                        if str(component.get('uid')) == uid:
-                            # Found it! Update status
-                            component['status'] = 'COMPLETED'
-                            component['completed'] = datetime.now()
-                            component['percent-complete'] = 100
-                            
-                            # Save back to Nextcloud
-                            todo_obj.data = ical.to_ical()
-                            todo_obj.save()
-                            
-                            title = str(component.get('summary', 'Unknown task'))
-                            logger.info(f"✅ Task completed: {title}")
-                            return title
-                            
-                except Exception as e:
-                    logger.debug(f"Error checking todo: {e}")
-                    continue
-            
-            raise Exception(f"Task not found: {uid}")
-            
+            data, headers = await self._request('GET', href, (200,))
+            try:
+                title = await self._save_completed(href, data, headers.get('ETag', etag), uid)
+            except CalDAVError as e:
+                if e.status != 412:
+                    raise
+                # Edited between our GET and PUT: start over from the new version, once
+                logger.info(f"Task {uid} changed while completing, retrying")
+                data, headers = await self._request('GET', href, (200,))
+                title = await self._save_completed(href, data, headers.get('ETag'), uid)
+
+            self._tasks_cache.invalidate()
+            logger.info(f"✅ Task completed: {title}")
+            return title
+
         except Exception as e:
             logger.error(f"Failed to complete task: {e}", exc_info=True)
             raise
-    
-    def _parse_todo(self, todo_obj) -> Task:
+
+    async def _save_completed(self, href: str, data: bytes, etag: Optional[str],
+                              uid: str) -> str:
         """
-        Parse a CalDAV todo object into a Task.
-        
+        Mark the VTODO in a calendar object complete and save it back.
+
         Args:
-            todo_obj: CalDAV todo object
-            
+            href: Absolute URL of the calendar object
+            data: Current iCalendar data
+            etag: ETag of data, sent as If-Match so concurrent edits aren't lost
+            uid: UID of the VTODO to complete
+
         Returns:
-            Task object
+            Task title
+
+        Raises:
+            LookupError if no matching VTODO is present
+            CalDAVError with status 412 if data changed on the server
         """
-        # Parse iCalendar data
-        ical = Calendar.from_ical(todo_obj.data)
-        
-        # Find VTODO component
-        for component in ical.walk('VTODO'):
-            uid = str(component.get('uid'))
-            title = str(component.get('summary', 'Untitled'))
-            
-            # Parse due date
-            due = component.get('due')
-            if due:
-                due = due.dt if hasattr(due, 'dt') else due
-                # Convert date to datetime if needed
-                if isinstance(due, date) and not isinstance(due, datetime):
-                    due = datetime.combine(due, datetime.max.time())
-            
-            # Parse status
-            status = str(component.get('status', 'NEEDS-ACTION'))
-            completed = status == 'COMPLETED'
-            
-            # Parse completed date
-            completed_date = component.get('completed')
-            if completed_date:
-                completed_date = completed_date.dt if hasattr(completed_date, 'dt') else completed_date
-            
-            # Parse description
-            description = component.get('description')
-            if description:
-                description = str(description)
-            
-            # Parse priority (0 = undefined, 1 = highest, 9 = lowest)
-            priority = int(component.get('priority', 0))
-            
-            return Task(
-                uid=uid,
-                title=title,
-                due=due,
-                completed=completed,
-                completed_date=completed_date,
-                description=description,
-                priority=priority
-            )
-        
-        raise ValueError("No VTODO component found in calendar data")
\ No newline at end of file
+        completed_at = datetime.now(timezone.utc)
+
+        try:
+            task = _parse_todo_fast(data)
+            new_data = _mark_completed(data, completed_at)
+        except Exception as e:
+            # Anything the line rewriter can't handle goes through icalendar
+            logger.debug(f"Fast completion failed ({e}), using icalendar")
+            title, new_data = _mark_completed_ical(data, completed_at, uid)
+        else:
+            if task.uid != uid:
+                raise LookupError(f"No matching VTODO in {href}")
+            title = task.title
+
+        # Save back to Nextcloud
+        headers = {'Content-Type': 'text/calendar; charset=utf-8'}
+        if etag:
+            headers['If-Match'] = etag
+        await self._request('PUT', href, (200, 201, 204), data=new_data, headers=headers)
+
+        return title
+
+
+def _parse_todo_ical(data: bytes, href: Optional[str] = None,
+                     etag: Optional[str] = None) -> Task:
+    """
+    Parse raw VTODO calendar data into a Task with the full icalendar parser.
+
+    Args:
+        data: iCalendar data from the CalDAV server
+        href: URL the data was fetched from (optional)
+        etag: ETag of the data (optional)
+
+    Returns:
+        Task object
+    """
+    # Parse iCalendar data
+    ical = Calendar.from_ical(data)
+
+    # Find VTODO component
+    for component in ical.walk('VTODO'):
+        uid = str(component.get('uid'))
+        title = str(component.get('summary', 'Untitled'))
+
+        # Parse due date
+        due = component.get('due')
+        if due:
+            due = due.dt if hasattr(due, 'dt') else due
+            # Convert date to datetime if needed
+            if isinstance(due, date) and not isinstance(due, datetime):
+                due = datetime.combine(due, datetime.max.time())
+
+        # Parse status
+        status = str(component.get('status', 'NEEDS-ACTION'))
+        completed = status == 'COMPLETED'
+
+        # Parse completed date
+        completed_date = component.get('completed')
+        if completed_date:
+            completed_date = completed_date.dt if hasattr(completed_date, 'dt') else completed_date
+
+        # Parse description
+        description = component.get('description')
+        if description:
+            description = str(description)
+
+        # Parse priority (0 = undefined, 1 = highest, 9 = lowest)
+        priority = int(component.get('priority', 0))
+
+        return Task(
+            uid=uid,
+            title=title,
+            due=due,
+            completed=completed,
+            completed_date=completed_date,
+            description=description,
+            priority=priority,
+            href=href,
+            etag=etag
+        )
+
+    raise ValueError("No VTODO component found in calendar data")
+
+
+def _unfold(data: bytes) -> bytes:
+    """Undo RFC 5545 line folding (CRLF/LF followed by a space or tab)."""
+    return _FOLD_RE.sub(b'', data)
+
+
+def _unescape(value: bytes) -> str:
+    """Decode an iCalendar TEXT value."""
+    return _ESCAPE_RE.sub(lambda m: _UNESCAPED[m.group(1)], value).decode('utf-8')
+
+
+def _local_due(task: Task) -> datetime:
+    """
+    Sort key for tasks that have a DUE. Floating (naive) and timezone-aware
+    due times can't be compared, so aware ones become naive local time.
+    """
+    return task.due.astimezone().replace(tzinfo=None) if task.due.tzinfo else task.due
+
+
+def _local_date(dt: datetime) -> date:
+    """Local calendar date of a due time; floating times are already local."""
+    return dt.astimezone().date() if dt.tzinfo else dt.date()
+
+
+def _parse_datetime(value: bytes, params: bytes) -> datetime:
+    """
+    Parse a DATE or DATE-TIME value.
+
+    DATE values become the end of that day, matching how due dates have always
+    been compared. UTC (Z) and TZID times are timezone-aware, floating times are
+    naive. Unknown TZIDs raise so the caller can fall back to icalendar.
+    """
+    v = value.strip()
+    if len(v) == 8:
+        return datetime(int(v[0:4]), int(v[4:6]), int(v[6:8]), 23, 59, 59, 999999)
+
+    if len(v) not in (15, 16) or v[8:9] != b'T':
+        raise ValueError(f"Unsupported date-time value: {v!r}")
+
+    tzinfo = None
+    if v.endswith(b'Z'):
+        tzinfo = timezone.utc
+    else:
+        tzid = _TZID_RE.search(params)
+        if tzid:
+            tzinfo = ZoneInfo(tzid.group(1).decode('utf-8'))
+
+    return datetime(int(v[0:4]), int(v[4:6]), int(v[6:8]),
+                    int(v[9:11]), int(v[11:13]), int(v[13:15]), tzinfo=tzinfo)
+
+
+def _parse_todo_fast(data: bytes, href: Optional[str] = None,
+                     etag: Optional[str] = None) -> Task:
+    """
+    Parse raw VTODO calendar data into a Task by scanning for the few
+    properties a Task needs, without building a component tree.
+
+    Raises on anything it doesn't understand; see _parse_todo().
+    """
+    todo = _VTODO_RE.search(_unfold(data))
+    if not todo:
+        raise ValueError("No VTODO component found in calendar data")
+
+    # Drop nested components (VALARM) so their SUMMARY/DESCRIPTION can't match;
+    # props maps name -> (params, value), first occurrence wins
+    props = {}
+    for m in _PROPERTY_RE.finditer(_SUBCOMPONENT_RE.sub(b'', todo.group(1))):
+        props.setdefault(m.group(1), (m.group(2), m.group(3)))
+
+    if b'UID' not in props:
+        raise ValueError("VTODO has no UID")
+
+    due = props.get(b'DUE')
+    completed_date = props.get(b'COMPLETED')
+    description = props.get(b'DESCRIPTION')
+    summary = props.get(b'SUMMARY')
+    status = props.get(b'STATUS')
+    priority = props.get(b'PRIORITY')
+
+    return Task(
+        uid=_unescape(props[b'UID'][1]),
+        title=_unescape(summary[1]) if summary else 'Untitled',
+        due=_parse_datetime(due[1], due[0]) if due else None,
+        completed=status is not None and status[1].strip() == b'COMPLETED',
+        completed_date=(
+            _parse_datetime(completed_date[1], completed_date[0]) if completed_date else None
+        ),
+        description=_unescape(description[1]) if description else None,
+        priority=int(priority[1]) if priority else 0,
+        href=href,
+        etag=etag
+    )
+
+
+def _parse_todo(data: bytes, href: Optional[str] = None,
+                etag: Optional[str] = None) -> Task:
+    """
+    Parse raw VTODO calendar data into a Task.
+
+    Uses the fast line scanner, falling back to icalendar for input it can't
+    handle (unknown TZIDs, malformed values, ...).
+
+    Args:
+        data: iCalendar data from the CalDAV server
+        href: URL the data was fetched from (optional)
+        etag: ETag of the data (optional)
+
+    Returns:
+        Task object
+    """
+    try:
+        return _parse_todo_fast(data, href=href, etag=etag)
+    except Exception as e:
+        logger.debug(f"Fast VTODO parse failed ({e}), using icalendar")
+        return _parse_todo_ical(data, href=href, etag=etag)
+
+
+def _safe_parse(todo: Tuple[str, str, bytes]) -> Optional[Task]:
+    """Parse one (href, etag, calendar data) triple, logging and returning None on failure."""
+    href, etag, data = todo
+    try:
+        return _parse_todo(data, href=href, etag=etag)
+    except Exception as e:
+        logger.warning(f"Failed to parse todo {href}: {e}")
+        return None
+
+
+def _parse_batch(todos: List[Tuple[str, str, bytes]]) -> List[Optional[Task]]:
+    """
+    Parse (href, etag, calendar data) triples, with None in place of tasks
+    that fail. Module-level so worker processes can run it.
+    """
+    return [_safe_parse(todo) for todo in todos]
+
+
+def _mark_completed(data: bytes, completed_at: datetime) -> bytes:
+    """
+    Mark the VTODO in calendar data complete by rewriting only the STATUS,
+    COMPLETED and PERCENT-COMPLETE lines (adding any that are missing).
+
+    Raises ValueError unless there is exactly one VTODO, e.g. for recurring
+    tasks with overridden instances; see _mark_completed_ical().
+    """
+    if data.count(b'BEGIN:VTODO') != 1:
+        raise ValueError("Expected exactly one VTODO")
+
+    start = data.index(b'BEGIN:VTODO')
+    end = _END_VTODO_RE.search(data, start)
+    if not end:
+        raise ValueError("Unterminated VTODO")
+
+    eol = b'\r\n' if b'\r\n' in data else b'\n'
+    body = data[start:end.start()]
+    missing = []
+
+    for line_re, line in (
+        (_STATUS_LINE_RE, b'STATUS:COMPLETED'),
+        (_COMPLETED_LINE_RE, b'COMPLETED:' + completed_at.strftime(_UTC_FORMAT).encode()),
+        (_PERCENT_LINE_RE, b'PERCENT-COMPLETE:100'),
+    ):
+        body, count = line_re.subn(line, body)
+        if not count:
+            missing.append(line + eol)
+
+    # New properties go before any nested component (VALARM), as RFC 5545 orders them
+    nested = _NESTED_BEGIN_RE.search(body, len(b'BEGIN:VTODO'))
+    split = nested.start() if nested else len(body)
+
+    return data[:start] + body[:split] + b''.join(missing) + body[split:] + data[end.start():]
+
+
+def _mark_completed_ical(data: bytes, completed_at: datetime, uid: str) -> Tuple[str, bytes]:
+    """
+    Mark the VTODO with the given UID complete using icalendar.
+
+    Returns:
+        (task title, updated calendar data)
+
+    Raises:
+        LookupError if no matching VTODO is present
+    """
+    ical = Calendar.from_ical(data)
+
+    for component in ical.walk('VTODO'):
+        if str(component.get('uid')) != uid:
+            continue
+
+        component['status'] = 'COMPLETED'
+        component['completed'] = vDatetime(completed_at)
+        component['percent-complete'] = 100
+
+        return str(component.get('summary', 'Unknown task')), ical.to_ical()
+
+    raise LookupError("No matching VTODO in calendar data")
@@ -0,0 +1,66 @@
+"""
+User-visible text for the Discord bot.
+
+Every string a Discord user can see is a module-level constant here, so
+handlers reuse one object per message instead of rebuilding literals on
+each interaction, and wording lives in one place. New handlers should add
+their text here and reference it as `strings.NAME`; text with placeholders
+is a str.format() template. Log messages stay inline.
+"""
+
+from typing import Final
+
+# strftime format for a task's due time
+TIME_FMT: Final = "%I:%M %p"
+
+# Slash command and parameter descriptions
+DESC_TASK_ADD: Final = "Add a new task (due today at 11:59 PM)"
+DESC_TASK_ADD_TITLE: Final = "What needs to be done?"
+DESC_TASK_LIST: Final = "List today's tasks"
+DESC_TASK_COMPLETE: Final = "Mark a task as complete"
+DESC_TASK_COMPLETE_ID: Final = "Task number from /task-list"
+DESC_TASK_HELP: Final = "Show help for task commands"
+
+# /task-add
+TITLE_TASK_CREATED: Final = "✅ Task Created"
+DESCRIPTION_TASK_CREATED: Final = "**{title}**"
+FIELD_DUE: Final = "Due"
+VALUE_DUE_TODAY: Final = "Today at 11:59 PM"
+FIELD_STATUS: Final = "Status"
+VALUE_STATUS_TODO: Final = "📝 To Do"
+FOOTER_TASK_CREATED: Final = "Use /task-list to see all tasks"
+ERROR_CREATE_TASK: Final = "❌ Failed to create task: {error}"
+
+# /task-list
+TITLE_TODAYS_TASKS: Final = "📋 Today's Tasks"
+DESCRIPTION_NO_TASKS: Final = "No tasks for today! 🎉"
+DESCRIPTION_TASK_COUNT: Final = "You have {count} task(s) to complete"
+FIELD_TASK: Final = "{number}. {title}"
+VALUE_TASK_DUE: Final = "Due: {due}"
+VALUE_NO_DUE_TIME: Final = "No time set"
+FOOTER_TASK_LIST: Final = "Use /task-complete <number> to mark tasks done"
+ERROR_LIST_TASKS: Final = "❌ Failed to list tasks: {error}"
+
+# /task-complete
+ERROR_INVALID_TASK_NUMBER: Final = (
+    "❌ Invalid task number: {task_id}\n"
+    "Use /task-list to see current task numbers."
+)
+TITLE_TASK_COMPLETED: Final = "✅ Task Completed!"
+DESCRIPTION_TASK_COMPLETED: Final = "~~{title}~~"
+FOOTER_TASK_COMPLETED: Final = "Great job! 🎉"
+ERROR_COMPLETE_TASK: Final = "❌ Failed to complete task: {error}"
+
+# /task-help
+TITLE_HELP: Final = "📖 Task Bot Help - v0.1 MVP"
+DESCRIPTION_HELP: Final = "Manage your Nextcloud tasks from Discord!"
+HELP_ADD_NAME: Final = "/task-add <title>"
+HELP_ADD_VALUE: Final = (
+    "Create a new task due today at 11:59 PM\n"
+    "Example: `/task-add Buy groceries`"
+)
+HELP_LIST_NAME: Final = "/task-list"
+HELP_LIST_VALUE: Final = "Show all incomplete tasks due today"
+HELP_COMPLETE_NAME: Final = "/task-complete <number>"
+HELP_COMPLETE_VALUE: Final = "Mark a task as complete\nExample: `/task-complete 1`"
+FOOTER_HELP: Final = "More features coming in v1.0!"
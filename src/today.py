@@ -0,0 +1,68 @@
+"""
+Shared "today" date range for the bot and the CalDAV client.
+
+Commands read TODAY's fields instead of calling datetime.now() themselves,
+so every command handled on the same day agrees on what "today" is. The
+fields are computed at import and kept current by `TODAY.run()`, which the
+application runs as a background task.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+# Longest the refresher sleeps between checks, in seconds
+REFRESH_INTERVAL = 60
+
+
+class _TodayCache:
+    """
+    Local date and the datetimes derived from it, recomputed at midnight.
+
+    Attributes:
+        date: Today's local date
+        start: Local midnight starting today, in UTC
+        end: Local midnight ending today, in UTC
+        due_23_59: Today at 11:59 PM local time, the default due time
+    """
+
+    def __init__(self):
+        self.refresh()
+
+    def refresh(self):
+        """Recompute every field from the current local date."""
+        today = datetime.now().astimezone().date()
+        self.date: date = today
+        self.start = datetime.combine(today, time.min).astimezone(timezone.utc)
+        # Computed separately rather than start + 1 day so DST changes are honoured
+        self.end = datetime.combine(today + timedelta(days=1), time.min).astimezone(timezone.utc)
+        self.due_23_59 = datetime.combine(today, time(23, 59))
+
+        now = datetime.now().astimezone()
+        next_midnight = datetime.combine(today + timedelta(days=1), time.min, now.tzinfo)
+        until_midnight = (next_midnight - now).total_seconds()
+        self._expires_at = monotonic() + max(until_midnight, 0)
+
+    def is_stale(self) -> bool:
+        """True once local midnight has passed, by either clock."""
+        return monotonic() >= self._expires_at or datetime.now().astimezone().date() != self.date
+
+    async def run(self):
+        """
+        Keep the fields current until cancelled.
+
+        Sleeps at most REFRESH_INTERVAL at a time and checks the monotonic
+        deadline as well as the wall clock, so a clock change or suspend
+        delays the rollover by at most one interval.
+        """
+        while True:
+            await asyncio.sleep(min(REFRESH_INTERVAL, max(self._expires_at - monotonic(), 0)))
+            if self.is_stale():
+                self.refresh()
+                logger.info(f"📅 Date rolled over to {self.date}")
+
+
+TODAY = _TodayCache()
@@ -0,0 +1,273 @@
+"""Tests for the hand-written VTODO parsing and rewriting in caldav_client."""
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from icalendar import Calendar
+
+from caldav_client import (
+    NextcloudTasksClient,
+    _local_due,
+    _mark_completed,
+    _parse_todo_fast,
+    _parse_todo_ical,
+)
+
+
+def _ics(*lines: str, eol: str = "\r\n") -> bytes:
+    """Wrap VTODO content lines in a VCALENDAR."""
+    return eol.join((
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//test//nextasks//EN",
+        "BEGIN:VTODO",
+        "UID:task-1",
+        "DTSTAMP:20261015T080000Z",
+        *lines,
+        "END:VTODO",
+        "END:VCALENDAR",
+        "",
+    )).encode()
+
+
+PARSE_CASES = {
+    "folded": _ics(
+        "SUMMARY:A summary long enough that the client",
+        "  folded it onto a second line",
+        "DUE:20261015T100000",
+    ),
+    "escaped": _ics(
+        "SUMMARY:Milk\\, eggs\\; bread \\\\ more",
+        "DESCRIPTION:First line\\nSecond line",
+        "DUE:20261015T100000",
+    ),
+    "date_only": _ics(
+        "SUMMARY:All day",
+        "DUE;VALUE=DATE:20261015",
+    ),
+    "utc": _ics(
+        "SUMMARY:UTC",
+        "DUE:20261015T100000Z",
+    ),
+    "tzid": _ics(
+        "SUMMARY:Berlin",
+        "DUE;TZID=Europe/Berlin:20261015T100000",
+    ),
+    "floating": _ics(
+        "SUMMARY:Floating",
+        "DUE:20261015T100000",
+    ),
+    "valarm": _ics(
+        "SUMMARY:Real summary",
+        "DUE:20261015T100000",
+        "BEGIN:VALARM",
+        "ACTION:DISPLAY",
+        "SUMMARY:Alarm summary",
+        "DESCRIPTION:Alarm description",
+        "TRIGGER:-PT15M",
+        "END:VALARM",
+    ),
+    "completed": _ics(
+        "SUMMARY:Done",
+        "DUE:20261015T100000Z",
+        "STATUS:COMPLETED",
+        "COMPLETED:20261015T090000Z",
+        "PERCENT-COMPLETE:100",
+        "PRIORITY:1",
+    ),
+    "lf_only": _ics(
+        "SUMMARY:Line feeds",
+        " only",
+        "DUE:20261015T100000",
+        eol="\n",
+    ),
+}
+
+
+@pytest.mark.parametrize("data", PARSE_CASES.values(), ids=PARSE_CASES.keys())
+def test_parse_todo_fast_matches_icalendar(data):
+    assert _parse_todo_fast(data, "href", "etag") == _parse_todo_ical(data, "href", "etag")
+
+
+def test_parse_todo_fast_values():
+    assert _parse_todo_fast(PARSE_CASES["folded"]).title == (
+        "A summary long enough that the client folded it onto a second line"
+    )
+
+    escaped = _parse_todo_fast(PARSE_CASES["escaped"])
+    assert escaped.title == "Milk, eggs; bread \\ more"
+    assert escaped.description == "First line\nSecond line"
+
+    assert _parse_todo_fast(PARSE_CASES["date_only"]).due == datetime(
+        2026, 10, 15, 23, 59, 59, 999999
+    )
+    assert _parse_todo_fast(PARSE_CASES["utc"]).due == datetime(
+        2026, 10, 15, 10, 0, tzinfo=timezone.utc
+    )
+    assert _parse_todo_fast(PARSE_CASES["tzid"]).due == datetime(
+        2026, 10, 15, 10, 0, tzinfo=ZoneInfo("Europe/Berlin")
+    )
+    assert _parse_todo_fast(PARSE_CASES["floating"]).due == datetime(2026, 10, 15, 10, 0)
+
+    alarm = _parse_todo_fast(PARSE_CASES["valarm"])
+    assert alarm.title == "Real summary"
+    assert alarm.description is None
+
+    done = _parse_todo_fast(PARSE_CASES["completed"])
+    assert done.completed
+    assert done.completed_date == datetime(2026, 10, 15, 9, 0, tzinfo=timezone.utc)
+    assert done.priority == 1
+
+
+def test_parse_todo_fast_rejects_unknown_tzid():
+    data = _ics("SUMMARY:Odd zone", "DUE;TZID=Not/A_Zone:20261015T100000")
+    with pytest.raises(Exception):
+        _parse_todo_fast(data)
+
+
+COMPLETED_AT = datetime(2026, 10, 15, 12, 30, tzinfo=timezone.utc)
+
+# A calendar object holding two VTODOs, as recurring tasks with overrides do
+TWO_TODOS = _ics("SUMMARY:First").replace(
+    b"END:VCALENDAR",
+    b"BEGIN:VTODO\r\nUID:task-2\r\nSUMMARY:Second\r\nEND:VTODO\r\nEND:VCALENDAR"
+)
+
+
+def _todo_lines(data: bytes) -> list:
+    """Content lines of the first VTODO, nested components included."""
+    lines = data.decode().splitlines()
+    return lines[lines.index("BEGIN:VTODO") + 1:lines.index("END:VTODO")]
+
+
+def test_mark_completed_rewrites_existing_lines():
+    data = _ics(
+        "SUMMARY:Existing",
+        "STATUS:NEEDS-ACTION",
+        "COMPLETED:20260101T000000Z",
+        "PERCENT-COMPLETE:40",
+        "DUE:20261015T100000",
+    )
+    lines = _todo_lines(_mark_completed(data, COMPLETED_AT))
+
+    assert lines.count("STATUS:COMPLETED") == 1
+    assert lines.count("COMPLETED:20261015T123000Z") == 1
+    assert lines.count("PERCENT-COMPLETE:100") == 1
+    assert not [line for line in lines if line.startswith(("STATUS:N", "COMPLETED:2026010"))]
+    # Untouched lines keep their place
+    assert lines.index("SUMMARY:Existing") == 2
+
+
+def test_mark_completed_adds_missing_lines():
+    data = _ics("SUMMARY:Missing", "DUE:20261015T100000")
+    task = _parse_todo_ical(_mark_completed(data, COMPLETED_AT))
+
+    assert task.completed
+    assert task.completed_date == COMPLETED_AT
+    assert task.title == "Missing"
+
+
+def test_mark_completed_inserts_before_valarm():
+    data = _ics(
+        "SUMMARY:With alarm",
+        "BEGIN:VALARM",
+        "ACTION:DISPLAY",
+        "DESCRIPTION:Alarm",
+        "TRIGGER:-PT15M",
+        "END:VALARM",
+    )
+    lines = _todo_lines(_mark_completed(data, COMPLETED_AT))
+    alarm = lines.index("BEGIN:VALARM")
+
+    for line in ("STATUS:COMPLETED", "COMPLETED:20261015T123000Z", "PERCENT-COMPLETE:100"):
+        assert lines.index(line) < alarm
+    assert lines[alarm:] == ["BEGIN:VALARM", "ACTION:DISPLAY", "DESCRIPTION:Alarm",
+                             "TRIGGER:-PT15M", "END:VALARM"]
+
+
+@pytest.mark.parametrize("eol", ["\r\n", "\n"], ids=["crlf", "lf"])
+def test_mark_completed_keeps_line_endings(eol):
+    data = _ics("SUMMARY:Endings", "STATUS:NEEDS-ACTION", eol=eol)
+    result = _mark_completed(data, COMPLETED_AT)
+
+    if eol == "\n":
+        assert b"\r" not in result
+    else:
+        assert result.count(b"\r\n") == result.count(b"\n")
+    assert _parse_todo_ical(result).completed
+
+
+def test_mark_completed_rejects_several_vtodos():
+    with pytest.raises(ValueError):
+        _mark_completed(TWO_TODOS, COMPLETED_AT)
+
+
+@pytest.mark.asyncio
+async def test_save_completed_falls_back_to_icalendar(monkeypatch):
+    client = NextcloudTasksClient("https://cloud.example", "bot", "secret")
+    puts = []
+
+    async def fake_request(method, url, expected, **kwargs):
+        puts.append((method, kwargs["data"], kwargs["headers"]))
+        return b"", {}
+
+    monkeypatch.setattr(client, "_request", fake_request)
+    try:
+        title = await client._save_completed(
+            "https://cloud.example/t.ics", TWO_TODOS, '"1"', "task-2"
+        )
+    finally:
+        await client.aclose()
+
+    assert title == "Second"
+    (method, saved, headers), = puts
+    assert method == "PUT"
+    assert headers["If-Match"] == '"1"'
+
+    todos = {str(c["uid"]): c for c in Calendar.from_ical(saved).walk("VTODO")}
+    assert str(todos["task-2"]["status"]) == "COMPLETED"
+    assert str(todos["task-1"].get("status", "")) != "COMPLETED"
+
+
+@pytest.fixture
+def berlin_time(monkeypatch):
+    """Run with Europe/Berlin as the local timezone."""
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_local_due_orders_floating_and_aware(berlin_time):
+    floating = _parse_todo_fast(_ics("UID:f", "DUE:20261015T110000"))
+    utc = _parse_todo_fast(_ics("DUE:20261015T083000Z"))  # 10:30 in Berlin
+    tzid = _parse_todo_fast(_ics("DUE;TZID=America/New_York:20261015T060000"))  # 12:00
+
+    assert sorted([tzid, floating, utc], key=_local_due) == [utc, floating, tzid]
+
+
+@pytest.mark.asyncio
+async def test_fetch_tasks_due_today_with_mixed_due_times(berlin_time, monkeypatch):
+    todos = [
+        ("/bot.ics", '"1"', _ics("SUMMARY:From the bot", "DUE:20261015T235900")),
+        ("/app.ics", '"2"', _ics("SUMMARY:From the app", "DUE;TZID=Europe/Berlin:20261015T090000")),
+        ("/utc.ics", '"3"', _ics("SUMMARY:Tomorrow", "DUE:20261015T230000Z")),
+    ]
+    client = NextcloudTasksClient("https://cloud.example", "bot", "secret")
+
+    async def fake_report(filters=""):
+        return todos
+
+    monkeypatch.setattr(client, "_report_todos", fake_report)
+    start = datetime(2026, 10, 14, 22, 0, tzinfo=timezone.utc)
+    try:
+        tasks = await client._fetch_tasks_due_today(
+            date(2026, 10, 15), start, start + timedelta(days=1)
+        )
+    finally:
+        await client.aclose()
+
+    assert [task.title for task in tasks] == ["From the app", "From the bot"]